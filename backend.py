@@ -23,6 +23,22 @@ def get_db_connection():
         print(f"Error connecting to the database: {e}")
         return None
 
+def execute_versioned_row(cur, query, params):
+    """Runs one row's versioned statement inside a savepoint so a bad row does not abort the others.
+
+    Returns "saved", "conflict" if no row matched the expected row_version, or "failed".
+    """
+    cur.execute("SAVEPOINT versioned_row;")
+    try:
+        cur.execute(query, params)
+    except psycopg2.Error as e:
+        cur.execute("ROLLBACK TO SAVEPOINT versioned_row;")
+        print(f"Error saving row: {e}")
+        return "failed"
+    matched = cur.rowcount
+    cur.execute("RELEASE SAVEPOINT versioned_row;")
+    return "saved" if matched else "conflict"
+
 # --- CRUD Operations for Employees ---
 
 def create_employee(first_name, last_name, email, phone_number, hire_date, salary, position_id):
@@ -58,23 +74,49 @@ def get_all_employees():
     finally:
         conn.close()
 
-def update_employee(employee_id, first_name, last_name, email, phone_number, hire_date, salary, position_id):
-    """Updates an existing employee record."""
+def update_employee(employee_id, first_name, last_name, email, phone_number, hire_date, salary, position_id, row_version):
+    """Updates an employee record if it is still at row_version.
+
+    Returns True if the row was updated, False if it failed or was changed by someone else.
+    """
+    result = update_employees([{
+        'employee_id': employee_id, 'first_name': first_name, 'last_name': last_name, 'email': email,
+        'phone_number': phone_number, 'hire_date': hire_date, 'salary': salary,
+        'position_id': position_id, 'row_version': row_version
+    }])
+    return result == ([], [])
+
+def update_employees(employees):
+    """Updates several employee records, skipping rows that changed since they were read.
+
+    Each employee is a dict of the employee columns plus the row_version it was read at.
+    Rows are saved independently. Returns (conflicts, failures), the employee_ids that
+    were changed by someone else and those that could not be saved, or None if the
+    update failed as a whole.
+    """
     conn = get_db_connection()
-    if not conn: return False
+    if not conn: return None
     try:
+        conflicts, failures = [], []
         with conn.cursor() as cur:
-            cur.execute("""
-                UPDATE employees
-                SET first_name = %s, last_name = %s, email = %s, phone_number = %s, hire_date = %s, salary = %s, position_id = %s
-                WHERE employee_id = %s;
-            """, (first_name, last_name, email, phone_number, hire_date, salary, position_id, employee_id))
+            for emp in employees:
+                outcome = execute_versioned_row(cur, """
+                    UPDATE employees
+                    SET first_name = %s, last_name = %s, email = %s, phone_number = %s, hire_date = %s, salary = %s, position_id = %s,
+                        row_version = row_version + 1
+                    WHERE employee_id = %s AND row_version = %s;
+                """, (emp['first_name'], emp['last_name'], emp['email'], emp['phone_number'], emp['hire_date'],
+                      emp['salary'], emp['position_id'], emp['employee_id'], emp['row_version']))
+                if outcome == "conflict":
+                    conflicts.append(emp['employee_id'])
+                elif outcome == "failed":
+                    failures.append(emp['employee_id'])
             conn.commit()
-        return True
+        return conflicts, failures
     except psycopg2.Error as e:
         conn.rollback()
-        print(f"Error updating employee: {e}")
-        return False
+        print(f"Error updating employees: {e}")
+        return None
     finally:
         conn.close()
 
@@ -143,39 +185,87 @@ def get_active_menu_items():
     finally:
         conn.close()
 
-def update_menu_item(menu_item_id, item_name, description, price, is_active):
-    """Updates an existing menu item."""
+def update_menu_item(menu_item_id, item_name, description, price, is_active, row_version):
+    """Updates a menu item if it is still at row_version.
+
+    Returns True if the row was updated, False if it failed or was changed by someone else.
+    """
+    result = update_menu_items([{
+        'menu_item_id': menu_item_id, 'item_name': item_name, 'description': description,
+        'price': price, 'is_active': is_active, 'row_version': row_version
+    }])
+    return result == ([], [])
+
+def update_menu_items(menu_items):
+    """Updates several menu items, skipping rows that changed since they were read.
+
+    Each menu item is a dict of the menu item columns plus the row_version it was read at.
+    Rows are saved independently. Returns (conflicts, failures), the menu_item_ids that
+    were changed by someone else and those that could not be saved, or None if the
+    update failed as a whole.
+    """
     conn = get_db_connection()
-    if not conn: return False
+    if not conn: return None
     try:
+        conflicts, failures = [], []
         with conn.cursor() as cur:
-            cur.execute("""
-                UPDATE menu_items
-                SET item_name = %s, description = %s, price = %s, is_active = %s
-                WHERE menu_item_id = %s;
-            """, (item_name, description, price, is_active, menu_item_id))
+            for item in menu_items:
+                outcome = execute_versioned_row(cur, """
+                    UPDATE menu_items
+                    SET item_name = %s, description = %s, price = %s, is_active = %s,
+                        row_version = row_version + 1
+                    WHERE menu_item_id = %s AND row_version = %s;
+                """, (item['item_name'], item['description'], item['price'], item['is_active'],
+                      item['menu_item_id'], item['row_version']))
+                if outcome == "conflict":
+                    conflicts.append(item['menu_item_id'])
+                elif outcome == "failed":
+                    failures.append(item['menu_item_id'])
             conn.commit()
-        return True
+        return conflicts, failures
     except psycopg2.Error as e:
         conn.rollback()
-        print(f"Error updating menu item: {e}")
-        return False
+        print(f"Error updating menu items: {e}")
+        return None
     finally:
         conn.close()
 
-def delete_menu_item(menu_item_id):
-    """Deletes a menu item."""
+def delete_menu_item(menu_item_id, row_version):
+    """Deletes a menu item if it is still at row_version.
+
+    Returns True if the row was deleted, False if it failed or was changed by someone else.
+    """
+    result = delete_menu_items([{'menu_item_id': menu_item_id, 'row_version': row_version}])
+    return result == ([], [])
+
+def delete_menu_items(menu_items):
+    """Deletes several menu items, skipping rows that changed since they were read.
+
+    Each menu item is a dict with the menu_item_id and the row_version it was read at.
+    Rows are deleted independently. Returns (conflicts, failures), the menu_item_ids that
+    were changed or removed by someone else and those that could not be deleted, or None
+    if the delete failed as a whole.
+    """
     conn = get_db_connection()
-    if not conn: return False
+    if not conn: return None
     try:
+        conflicts, failures = [], []
         with conn.cursor() as cur:
-            cur.execute("DELETE FROM menu_items WHERE menu_item_id = %s;", (menu_item_id,))
+            for item in menu_items:
+                outcome = execute_versioned_row(
+                    cur, "DELETE FROM menu_items WHERE menu_item_id = %s AND row_version = %s;",
+                    (item['menu_item_id'], item['row_version'])
+                )
+                if outcome == "conflict":
+                    conflicts.append(item['menu_item_id'])
+                elif outcome == "failed":
+                    failures.append(item['menu_item_id'])
             conn.commit()
-        return True
+        return conflicts, failures
     except psycopg2.Error as e:
         conn.rollback()
-        print(f"Error deleting menu item: {e}")
-        return False
+        print(f"Error deleting menu items: {e}")
+        return None
     finally:
         conn.close()
 
@@ -263,6 +353,32 @@ def get_customer_orders(customer_id):
     finally:
         conn.close()
 
+def get_hourly_item_demand(since):
+    """Fetches hourly ordered quantities per menu item since the given datetime.
+
+    Returns plain tuples of (menu_item_id, hour_epoch, quantity), where hour_epoch
+    is the start of the hour in seconds since 1970-01-01. Cancelled orders are excluded.
+    """
+    conn = get_db_connection()
+    if not conn: return []
+    try:
+        with conn.cursor() as cur:
+            cur.execute("""
+                SELECT od.menu_item_id,
+                       EXTRACT(EPOCH FROM date_trunc('hour', o.order_date))::bigint AS hour_epoch,
+                       SUM(od.quantity) AS quantity
+                FROM orders o
+                JOIN order_details od ON o.order_id = od.order_id
+                WHERE o.order_date >= %s AND o.status IS DISTINCT FROM 'cancelled'
+                GROUP BY od.menu_item_id, hour_epoch;
+            """, (since,))
+            return cur.fetchall()
+    except psycopg2.Error as e:
+        print(f"Error fetching hourly item demand: {e}")
+        return []
+    finally:
+        conn.close()
+
 # --- Utility Functions ---
 
 def get_positions():
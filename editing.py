@@ -0,0 +1,49 @@
+# editing.py
+
+# --- Data Editor Change Tracking ---
+# Helpers used by the data editors in frontend.py to work out what to save and what
+# to do with the result. They only use pandas, so they can be imported without Streamlit.
+
+def changed_rows(df, edited_df, id_column):
+    """Returns the rows of edited_df that differ from the same row in df, matched on id_column.
+
+    Rows without an id (newly added in the editor) and rows no longer in df are ignored.
+    Missing values compare equal to each other.
+    """
+    original = df.set_index(id_column)
+    edited = edited_df.dropna(subset=[id_column]).set_index(id_column)
+    common = edited.index.intersection(original.index)
+    before = original.loc[common, original.columns]
+    after = edited.loc[common, original.columns]
+    unchanged = ((before == after) | (before.isna() & after.isna())).all(axis=1)
+    return after[~unchanged].reset_index()
+
+def resolve_result(labels, result):
+    """Returns the (conflicts, failures) pair for a save of the ids in labels.
+
+    result is what the backend returned; None means the save failed as a whole, so every
+    submitted id counts as failed.
+    """
+    if result is None:
+        return [], list(labels)
+    return list(result[0]), list(result[1])
+
+def merge_results(*batches):
+    """Combines (ids, result) pairs from several backend saves into one (conflicts, failures) pair."""
+    conflicts, failures = [], []
+    for ids, result in batches:
+        batch_conflicts, batch_failures = resolve_result(ids, result)
+        conflicts.extend(batch_conflicts)
+        failures.extend(batch_failures)
+    return conflicts, failures
+
+def advance_versions(versions, saved_ids, deleted=()):
+    """Moves the loaded versions of rows that were just saved on to their new version.
+
+    Updated rows go up by one, as the backend does; deleted rows are forgotten.
+    """
+    for row_id in saved_ids:
+        if row_id in deleted:
+            versions.pop(row_id, None)
+        else:
+            versions[row_id] += 1
@@ -0,0 +1,135 @@
+# forecasting.py
+import numpy as np
+import pandas as pd
+import backend  # Import the backend file
+from datetime import datetime, timedelta
+
+# --- Configuration ---
+# Order timestamps are handled as whole hours counted from this epoch, matching
+# EXTRACT(EPOCH FROM ...) in backend.get_hourly_item_demand.
+EPOCH = datetime(1970, 1, 1)
+HOURS_PER_WEEK = 168
+# 1970-01-01 was a Thursday; shifting by 3 days makes Monday day 0 of the week.
+EPOCH_WEEKDAY = 3
+
+# --- Calendar Helpers ---
+
+def to_hour(moment):
+    """Converts a datetime to whole hours since EPOCH."""
+    return int((moment - EPOCH).total_seconds()) // 3600
+
+def season_slot(hours):
+    """Maps hours since EPOCH to their day-of-week x hour slot (0 = Monday 00:00)."""
+    hours = np.asarray(hours, dtype=np.int64)
+    weekday = (hours // 24 + EPOCH_WEEKDAY) % 7
+    return weekday * 24 + hours % 24
+
+def week_start(hour):
+    """Returns the hour of the Monday 00:00 on or before the given hour."""
+    return int(hour - season_slot(hour))
+
+# --- Model ---
+
+def index_demand_rows(rows, item_ids):
+    """Splits (menu_item_id, hour_epoch, quantity) rows into NumPy columns.
+
+    Returns (item_index, hours, quantities), where item_index is the row's position in
+    item_ids. Rows for items not in item_ids are dropped.
+    """
+    if not rows:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, np.zeros(0)
+
+    data = np.asarray(rows, dtype=object)
+    item_index = pd.Index(item_ids).get_indexer(data[:, 0]).astype(np.int64)
+    hours = data[:, 1].astype(np.int64) // 3600
+    quantities = data[:, 2].astype(float)
+
+    known = item_index >= 0
+    return item_index[known], hours[known], quantities[known]
+
+def fit_seasonal_levels(item_index, hours, quantities, n_items, start_hour, end_hour, alpha):
+    """Fits a smoothed day-of-week x hour baseline for every item at once.
+
+    Each of the 168 weekly slots is exponentially smoothed across weeks, starting from
+    the first observed week. Hours with no orders count as zero demand. Only hours in
+    [start_hour, end_hour) are used, and start_hour must be a Monday 00:00.
+
+    Because hours without orders contribute nothing, the smoothed level is computed
+    in closed form as a weighted sum over the order rows, so the full item x hour
+    matrix is never materialised. Returns an (n_items, 168) array.
+    """
+    in_window = (hours >= start_hour) & (hours < end_hour)
+    item_index, hours, quantities = item_index[in_window], hours[in_window], quantities[in_window]
+
+    offset = hours - start_hour
+    weeks = offset // HOURS_PER_WEEK
+    slots = offset % HOURS_PER_WEEK
+
+    # Number of weeks in which each slot has already been observed.
+    observed = (end_hour - start_hour - np.arange(HOURS_PER_WEEK) + HOURS_PER_WEEK - 1) // HOURS_PER_WEEK
+    last = observed[slots] - 1 - weeks
+    weights = np.where(weeks == 0, (1 - alpha) ** last, alpha * (1 - alpha) ** last)
+
+    levels = np.bincount(
+        item_index * HOURS_PER_WEEK + slots,
+        weights=quantities * weights,
+        minlength=n_items * HOURS_PER_WEEK
+    )
+    return levels.reshape(n_items, HOURS_PER_WEEK)
+
+def forecast_hours(levels, first_hour, horizon_hours):
+    """Sums each item's seasonal levels over the horizon_hours starting at first_hour."""
+    slots = season_slot(first_hour + np.arange(horizon_hours))
+    return levels[:, slots].sum(axis=1)
+
+# --- Prep Planning ---
+
+def fit_prep_model(history_weeks=104, alpha=0.3, now=None):
+    """Fits seasonal levels for every active menu item from up to history_weeks of orders.
+
+    Returns (menu_items, levels, current_hour), which plan_prep turns into prep quantities.
+    """
+    current_hour = to_hour(now or datetime.now())
+    menu_items = backend.get_active_menu_items()
+    if not menu_items:
+        return [], np.zeros((0, HOURS_PER_WEEK)), current_hour
+
+    start_hour = week_start(current_hour - history_weeks * HOURS_PER_WEEK)
+    rows = backend.get_hourly_item_demand(EPOCH + timedelta(hours=start_hour))
+
+    item_ids = [item['menu_item_id'] for item in menu_items]
+    item_index, hours, quantities = index_demand_rows(rows, item_ids)
+    if len(hours):
+        # Start smoothing at the first week with any orders rather than at empty history.
+        start_hour = max(start_hour, week_start(hours.min()))
+
+    # The current hour is still in progress, so it is left out of the fit.
+    levels = fit_seasonal_levels(item_index, hours, quantities, len(item_ids), start_hour, current_hour, alpha)
+    return menu_items, levels, current_hour
+
+def plan_prep(menu_items, levels, current_hour, horizon_hours):
+    """Turns fitted levels into prep quantities for the horizon_hours following current_hour.
+
+    Returns a list of dicts sorted by expected demand, highest first.
+    """
+    forecast = forecast_hours(levels, current_hour + 1, horizon_hours)
+
+    prep = []
+    for i in np.argsort(-forecast, kind="stable"):
+        prep.append({
+            'menu_item_id': menu_items[i]['menu_item_id'],
+            'item_name': menu_items[i]['item_name'],
+            'forecast_quantity': round(float(forecast[i]), 2),
+            'prep_quantity': int(np.ceil(forecast[i]))
+        })
+    return prep
+
+def forecast_prep_quantities(history_weeks=104, horizon_hours=4, alpha=0.3, now=None):
+    """Forecasts the quantity of each active menu item needed for the next service.
+
+    The next service is the horizon_hours following the current hour. Returns a list of
+    dicts sorted by expected demand, highest first.
+    """
+    menu_items, levels, current_hour = fit_prep_model(history_weeks, alpha, now)
+    return plan_prep(menu_items, levels, current_hour, horizon_hours)
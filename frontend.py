@@ -2,7 +2,9 @@
 import streamlit as st
 import pandas as pd
 import backend  # Import the backend file
-from datetime import date
+import editing
+import forecasting
+from datetime import date, datetime, timedelta
 
 # --- Role-Based Login and Session State Management ---
 # Hardcoded passwords for demonstration purposes, as requested.
@@ -50,6 +52,73 @@ def logout():
     st.success("You have been logged out.")
     st.rerun()
 
+# --- Data Editor Helpers ---
+
+def load_snapshot(name, load_rows, id_column):
+    """Returns the rows an editor was opened with, loading them on first use.
+
+    Saves are checked against the row versions loaded with this snapshot rather than
+    against a fresh read, so changes made by someone else after the user loaded the rows
+    are caught. The versions are kept apart from the rows, keyed by id_column, so they
+    can move on after a partial save without resetting the editor.
+    """
+    if f"{name}_snapshot" not in st.session_state:
+        df = load_rows()
+        st.session_state[f"{name}_snapshot"] = df
+        st.session_state[f"{name}_versions"] = (
+            dict(zip(df[id_column], (int(version) for version in df["row_version"]))) if not df.empty else {}
+        )
+    return st.session_state[f"{name}_snapshot"]
+
+def snapshot_versions(name):
+    """Returns the row_version each row had when the snapshot was loaded, keyed by id."""
+    return st.session_state[f"{name}_versions"]
+
+def clear_snapshot(name, editor_key):
+    """Drops an editor's snapshot and pending edits so the next run shows the latest rows."""
+    st.session_state.pop(f"{name}_snapshot", None)
+    st.session_state.pop(f"{name}_versions", None)
+    st.session_state.pop(editor_key, None)
+
+def finish_save(name, editor_key, labels, result, deleted=()):
+    """Records the outcome of a bulk save so it can be shown after the rerun.
+
+    labels maps each submitted id to the name shown to the user, and result is the
+    (conflicts, failures) pair returned by the backend, or None if the save failed as a
+    whole. deleted lists the submitted ids that were deletes. If no row failed, the
+    snapshot and pending edits are dropped so the latest rows load. Otherwise the user's
+    edits are kept, and the rows that did save move on to their new version (or are
+    forgotten, if deleted) so that saving again does not report them as conflicts.
+    """
+    conflicts, failures = editing.resolve_result(labels, result)
+    if conflicts:
+        st.session_state[f"{name}_conflicts"] = [labels[row_id] for row_id in conflicts]
+    if not failures:
+        clear_snapshot(name, editor_key)
+        return
+
+    st.session_state[f"{name}_save_error"] = (
+        "These rows could not be saved: " + ", ".join(labels[row_id] for row_id in failures)
+        + ". Your edits have been kept; correct them and save again."
+    )
+    saved_ids = [row_id for row_id in labels if row_id not in conflicts and row_id not in failures]
+    editing.advance_versions(snapshot_versions(name), saved_ids, deleted)
+
+def show_conflicts(name):
+    """Shows, once, the rows from the last save that were changed by someone else in the meantime."""
+    conflicts = st.session_state.pop(f"{name}_conflicts", None)
+    if conflicts:
+        st.warning(
+            "These rows were changed by someone else after you loaded them and were not saved: "
+            + ", ".join(conflicts) + ". Reload to see their latest values, then re-apply your edits."
+        )
+
+def show_save_error(name):
+    """Shows, once, the error recorded by the last save before it reran the page."""
+    message = st.session_state.pop(f"{name}_save_error", None)
+    if message:
+        st.error(message)
+
 # --- Views ---
 
 def employee_view():
@@ -58,7 +127,7 @@ def employee_view():
     st.write(f"Logged in as: **{st.session_state.user_email}** ({st.session_state.role.capitalize()})")
 
     st.sidebar.title("Navigation")
-    view = st.sidebar.radio("Go to", ["Manage Menu", "Manage Employees", "View Orders"])
+    view = st.sidebar.radio("Go to", ["Manage Menu", "Manage Employees", "View Orders", "Prep Forecast"])
 
     if view == "Manage Menu":
         manage_menu_view()
@@ -66,6 +135,8 @@ def employee_view():
         manage_employees_view()
     elif view == "View Orders":
         view_orders_view()
+    elif view == "Prep Forecast":
+        prep_forecast_view()
 
 def manage_menu_view():
     """CRUD operations for menu items."""
@@ -82,6 +153,7 @@ def manage_menu_view():
 
         if submitted:
             if backend.create_menu_item(item_name, description, price, is_active):
+                clear_snapshot("menu", "menu_item_editor")
                 st.success(f"Successfully added '{item_name}' to the menu.")
             else:
                 st.error("Failed to add menu item.")
@@ -90,9 +162,10 @@ def manage_menu_view():
 
     # Read/Update/Delete Table
     st.subheader("Existing Menu Items")
-    menu_items = backend.get_all_menu_items()
-    if menu_items:
-        df = pd.DataFrame(menu_items)
+    show_save_error("menu")
+    show_conflicts("menu")
+    df = load_snapshot("menu", lambda: pd.DataFrame(backend.get_all_menu_items()), "menu_item_id")
+    if not df.empty:
         edited_df = st.data_editor(
             df,
             column_config={
@@ -101,6 +174,7 @@ def manage_menu_view():
                 "description": "Description",
                 "price": st.column_config.NumberColumn("Price", format="%.2f"),
                 "is_active": st.column_config.CheckboxColumn("Active?", default=True),
+                "row_version": None,
             },
             hide_index=True,
             num_rows="dynamic",
@@ -110,32 +184,54 @@ def manage_menu_view():
         
         # Check for updates and deletions
         if st.button("Save Changes"):
-            current_ids = set(df["menu_item_id"])
             edited_ids = set(edited_df["menu_item_id"])
-
-            # Detect and handle deleted rows
-            deleted_ids = list(current_ids - edited_ids)
+            loaded_versions = snapshot_versions("menu")
+            item_names = dict(zip(df["menu_item_id"], df["item_name"].astype(str)))
+
+            # Detect deleted rows; rows already deleted by an earlier partial save are skipped
+            batches = []
+            deleted_ids = [
+                item_id for item_id in df["menu_item_id"] if item_id not in edited_ids and item_id in loaded_versions
+            ]
             if deleted_ids:
-                for item_id in deleted_ids:
-                    if backend.delete_menu_item(item_id):
-                        st.success(f"Successfully deleted menu item with ID: {item_id}")
-                    else:
-                        st.error(f"Failed to delete menu item with ID: {item_id}")
-            
-            # Detect and handle updated rows
-            for index, row in edited_df.iterrows():
-                original_row = df[df["menu_item_id"] == row["menu_item_id"]]
-                if not original_row.empty and not original_row.equals(row):
-                    if backend.update_menu_item(
-                        row["menu_item_id"], row["item_name"], row["description"], row["price"], row["is_active"]
-                    ):
-                        st.success(f"Successfully updated menu item: {row['item_name']}")
-                    else:
-                        st.error(f"Failed to update menu item: {row['item_name']}")
+                batches.append((deleted_ids, backend.delete_menu_items([
+                    {'menu_item_id': item_id, 'row_version': loaded_versions[item_id]} for item_id in deleted_ids
+                ])))
+
+            # Detect updated rows
+            updated = editing.changed_rows(df, edited_df, "menu_item_id")
+            updated_ids = list(updated["menu_item_id"])
+            if updated_ids:
+                batches.append((updated_ids, backend.update_menu_items([
+                    {
+                        'menu_item_id': row["menu_item_id"], 'item_name': row["item_name"],
+                        'description': row["description"], 'price': row["price"],
+                        'is_active': bool(row["is_active"]),
+                        'row_version': loaded_versions[row["menu_item_id"]]
+                    }
+                    for index, row in updated.iterrows()
+                ])))
+
+            # Rows changed by someone else since loading are skipped and reported after the rerun
+            labels = {item_id: item_names[item_id] for item_id in deleted_ids}
+            labels.update(zip(updated["menu_item_id"], updated["item_name"].astype(str)))
+            result = editing.merge_results(*batches)
+            finish_save("menu", "menu_item_editor", labels, result, deleted=deleted_ids)
+            st.rerun()
+        if st.button("Reload Menu Items"):
+            clear_snapshot("menu", "menu_item_editor")
             st.rerun()
     else:
         st.info("No menu items found.")
 
+def load_employees_df():
+    """Loads all employees into a DataFrame for the employee editor."""
+    df = pd.DataFrame(backend.get_all_employees())
+    if not df.empty:
+        df['hire_date'] = pd.to_datetime(df['hire_date']).dt.date
+        df['salary'] = df['salary'].astype(float)
+    return df
+
 def manage_employees_view():
     """CRUD operations for employees."""
     st.header("Manage Employees")
@@ -162,6 +258,7 @@ def manage_employees_view():
         if submitted:
             position_id = position_map[position_name]
             if backend.create_employee(first_name, last_name, email, phone_number, hire_date, salary, position_id):
+                clear_snapshot("employee", "employee_editor")
                 st.success(f"Employee {first_name} {last_name} added successfully.")
             else:
                 st.error("Failed to add new employee.")
@@ -170,12 +267,10 @@ def manage_employees_view():
 
     # Read/Update/Delete Table (simplified for demo)
     st.subheader("Existing Employees")
-    employees = backend.get_all_employees()
-    if employees:
-        df = pd.DataFrame(employees)
-        df['hire_date'] = pd.to_datetime(df['hire_date']).dt.date
-        df['salary'] = df['salary'].astype(float)
-        
+    show_save_error("employee")
+    show_conflicts("employee")
+    df = load_snapshot("employee", load_employees_df, "employee_id")
+    if not df.empty:
         # Display table and allow for updates
         edited_df = st.data_editor(
             df,
@@ -187,7 +282,8 @@ def manage_employees_view():
                 "phone_number": "Phone",
                 "hire_date": "Hire Date",
                 "salary": st.column_config.NumberColumn("Salary", format="%.2f"),
-                "position_name": "Position"
+                "position_name": "Position",
+                "row_version": None
             },
             hide_index=True,
             disabled=["employee_id"],
@@ -195,23 +291,33 @@ def manage_employees_view():
             key="employee_editor"
         )
 
+        st.caption("Note: Deleting employees is not supported in this simplified view to prevent accidental data loss. Please use SQL directly if needed.")
         if st.button("Update Employee Info"):
-            st.warning("Note: Deleting employees is not supported in this simplified view to prevent accidental data loss. Please use SQL directly if needed.")
-            for index, row in edited_df.iterrows():
-                original_row = df[df["employee_id"] == row["employee_id"]]
-                if not original_row.empty and not original_row.equals(row):
-                    # Find position_id from position_name
-                    updated_position_name = row['position_name']
-                    updated_position_id = next((pos['position_id'] for pos in positions if pos['position_name'] == updated_position_name), None)
-
-                    if updated_position_id:
-                        if backend.update_employee(
-                            row["employee_id"], row["first_name"], row["last_name"], row["email"], 
-                            row["phone_number"], row["hire_date"], row["salary"], updated_position_id
-                        ):
-                            st.success(f"Successfully updated employee: {row['first_name']} {row['last_name']}")
-                        else:
-                            st.error(f"Failed to update employee: {row['first_name']} {row['last_name']}")
+            updates = []
+            loaded_versions = snapshot_versions("employee")
+            for index, row in editing.changed_rows(df, edited_df, "employee_id").iterrows():
+                # Find position_id from position_name
+                updated_position_name = row['position_name']
+                updated_position_id = next((pos['position_id'] for pos in positions if pos['position_name'] == updated_position_name), None)
+
+                if updated_position_id:
+                    updates.append({
+                        'employee_id': row["employee_id"], 'first_name': row["first_name"],
+                        'last_name': row["last_name"], 'email': row["email"],
+                        'phone_number': row["phone_number"], 'hire_date': row["hire_date"],
+                        'salary': row["salary"], 'position_id': updated_position_id,
+                        'row_version': loaded_versions[row["employee_id"]]
+                    })
+
+            # Rows changed by someone else since loading are skipped and reported after the rerun
+            if updates:
+                labels = {emp['employee_id']: f"{emp['first_name']} {emp['last_name']}" for emp in updates}
+                finish_save("employee", "employee_editor", labels, backend.update_employees(updates))
+            else:
+                clear_snapshot("employee", "employee_editor")
+            st.rerun()
+        if st.button("Reload Employees"):
+            clear_snapshot("employee", "employee_editor")
             st.rerun()
     else:
         st.info("No employees found.")
@@ -262,6 +368,39 @@ def view_orders_view():
     else:
         st.info("No orders found.")
 
+@st.cache_data(ttl=600)
+def load_prep_model(history_weeks, current_hour):
+    """Fits the prep forecast once per history length and hour, instead of on every rerun."""
+    return forecasting.fit_prep_model(history_weeks=history_weeks, now=forecasting.EPOCH + timedelta(hours=current_hour))
+
+def prep_forecast_view():
+    """Forecast of item quantities to prep for the next service (kitchen-facing)."""
+    st.header("Prep Forecast")
+    st.write("Expected demand per menu item, based on day-of-week and hour-of-day ordering patterns.")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        horizon_hours = st.number_input("Next service length (hours)", min_value=1, max_value=24, value=4, step=1)
+    with col2:
+        history_weeks = st.number_input("History to use (weeks)", min_value=1, max_value=260, value=104, step=1)
+
+    menu_items, levels, current_hour = load_prep_model(int(history_weeks), forecasting.to_hour(datetime.now()))
+    prep = forecasting.plan_prep(menu_items, levels, current_hour, int(horizon_hours))
+    if prep:
+        df = pd.DataFrame(prep)
+        st.dataframe(
+            df,
+            column_config={
+                "menu_item_id": None,
+                "item_name": "Item Name",
+                "forecast_quantity": st.column_config.NumberColumn("Expected Orders", format="%.2f"),
+                "prep_quantity": st.column_config.NumberColumn("Prep Quantity", format="%d"),
+            },
+            hide_index=True,
+            use_container_width=True
+        )
+    else:
+        st.info("No active menu items to forecast.")
 
 def customer_view():
     """Main view for customers."""
@@ -303,6 +442,7 @@ def customer_view():
             "description": "Description",
             "price": st.column_config.NumberColumn("Price", format="%.2f", disabled=True),
             "is_active": None,
+            "row_version": None,
             "quantity": st.column_config.NumberColumn("Quantity", min_value=0, step=1, format="%d"),
         },
         hide_index=True,
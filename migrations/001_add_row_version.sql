@@ -0,0 +1,5 @@
+-- Row version columns used by backend.update_employees / backend.update_menu_items
+-- for optimistic concurrency: an update only applies if the row is still at the
+-- version the editor loaded, and bumps it by one.
+ALTER TABLE employees ADD COLUMN IF NOT EXISTS row_version INTEGER NOT NULL DEFAULT 1;
+ALTER TABLE menu_items ADD COLUMN IF NOT EXISTS row_version INTEGER NOT NULL DEFAULT 1;
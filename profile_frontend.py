@@ -0,0 +1,325 @@
+# profile_frontend.py
+"""Headless render profiler for the views in frontend.py.
+
+Logs in as each account in frontend.ROLES using Streamlit's AppTest, drives every
+view it can reach and reports, per view, the time spent in backend calls, pandas
+conversion, app-side computation (the forecasting module) and rendering, plus peak
+Python memory. Exits with status 1 if any view goes over the latency budget.
+
+By default the backend is replaced with synthetic data of the requested scale, so
+no database is needed:
+
+    python profile_frontend.py --scale 5000 --budget-ms 2000
+
+Use --live to profile against the database configured in backend.DB_CONFIG instead.
+"""
+import argparse
+import ast
+import importlib
+import inspect
+import json
+import os
+import sys
+import time
+import tracemalloc
+import types
+import uuid
+from datetime import date, datetime, timedelta
+
+import pandas as pd
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+FRONTEND_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "frontend.py")
+CUSTOMER_VIEW = "Customer Portal"
+# Session state keys under which frontend.load_snapshot keeps the data editors' rows.
+EDITOR_SNAPSHOTS = ["menu_snapshot", "employee_snapshot"]
+
+# --- Phase Timing ---
+
+class PhaseTimer:
+    """Accumulates wall-clock time per phase.
+
+    Time spent in a nested timed call is charged to the inner call's phase and taken
+    off its caller's, so backend calls made from the forecasting code count as backend.
+    """
+
+    def __init__(self):
+        self.totals = {}
+        self.children = []
+
+    def reset(self):
+        self.totals = {}
+
+    def wrap(self, phase, func):
+        """Returns func wrapped so that its running time, minus timed nested calls, is added to phase."""
+        def timed(*args, **kwargs):
+            self.children.append(0.0)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                nested = self.children.pop()
+                self.totals[phase] = self.totals.get(phase, 0.0) + elapsed - nested
+                if self.children:
+                    self.children[-1] += elapsed
+        timed.__name__ = getattr(func, "__name__", "timed")
+        timed.__doc__ = getattr(func, "__doc__", None)
+        return timed
+
+def instrument_pandas(timer):
+    """Times the pandas conversions the views perform. Returns a function that undoes it."""
+    originals = [
+        (pd.DataFrame, "__init__", pd.DataFrame.__init__),
+        (pd.Series, "astype", pd.Series.astype),
+        (pd, "to_datetime", pd.to_datetime),
+    ]
+    for owner, name, func in originals:
+        setattr(owner, name, timer.wrap("pandas", func))
+
+    def restore():
+        for owner, name, func in originals:
+            setattr(owner, name, func)
+    return restore
+
+def instrument_backend(timer, source):
+    """Installs a copy of the backend module whose public functions are timed."""
+    module = types.ModuleType("backend")
+    for name in dir(source):
+        value = getattr(source, name)
+        if callable(value) and not name.startswith("_") and not isinstance(value, type):
+            value = timer.wrap("backend", value)
+        setattr(module, name, value)
+    sys.modules["backend"] = module
+    # forecasting holds its own reference to backend, so make the frontend re-import it.
+    sys.modules.pop("forecasting", None)
+
+def instrument_compute(timer):
+    """Times the forecasting module's functions as app-side computation."""
+    forecasting = importlib.import_module("forecasting")
+    for name, func in inspect.getmembers(forecasting, inspect.isfunction):
+        if func.__module__ == forecasting.__name__ and not name.startswith("_"):
+            setattr(forecasting, name, timer.wrap("compute", func))
+
+# --- Synthetic Backend ---
+
+def synthetic_backend(scale):
+    """Builds a stand-in for backend.py that serves `scale` rows per table from memory."""
+    positions = [
+        {'position_id': i + 1, 'position_name': name}
+        for i, name in enumerate(["Chef", "Host", "Manager", "Waiter"])
+    ]
+    menu_items = [
+        {
+            'menu_item_id': str(uuid.UUID(int=i)), 'item_name': f"Item {i:05d}",
+            'description': f"Description of item {i}", 'price': 5 + i % 40 + 0.99,
+            'is_active': i % 10 != 0, 'row_version': 1
+        }
+        for i in range(scale)
+    ]
+    employees = [
+        {
+            'employee_id': str(uuid.UUID(int=i)), 'first_name': f"First{i}", 'last_name': f"Last{i:05d}",
+            'email': f"employee{i}@restaurant.com", 'phone_number': f"555-{i:07d}",
+            'hire_date': date(2020, 1, 1) + timedelta(days=i % 1500), 'salary': 30000 + i % 50 * 500,
+            'position_id': positions[i % len(positions)]['position_id'], 'row_version': 1,
+            'position_name': positions[i % len(positions)]['position_name']
+        }
+        for i in range(scale)
+    ]
+    now = datetime.now()
+    statuses = ["pending", "in progress", "completed", "cancelled"]
+    orders = [
+        {
+            'order_id': str(uuid.UUID(int=i)), 'order_date': now - timedelta(minutes=17 * i),
+            'status': statuses[i % len(statuses)], 'total_amount': 10 + i % 90 + 0.5,
+            'customer_first_name': f"Customer{i}", 'customer_last_name': f"Guest{i}",
+            'employee_first_name': f"First{i % scale}", 'employee_last_name': f"Last{i % scale:05d}"
+        }
+        for i in range(scale)
+    ]
+    customer_orders = [
+        {
+            'order_id': str(uuid.UUID(int=i // 3)), 'order_date': now - timedelta(hours=i),
+            'status': statuses[i % len(statuses)], 'total_amount': 25.5,
+            'item_name': f"Item {i % scale:05d}", 'quantity': 1 + i % 3, 'price_at_time_of_order': 8.5
+        }
+        for i in range(scale)
+    ]
+    current_hour = int((now - datetime(1970, 1, 1)).total_seconds()) // 3600
+    hourly_demand = [
+        (item['menu_item_id'], (current_hour - 1 - h * 7) * 3600, 1 + h % 4)
+        for item in menu_items
+        for h in range(10)
+    ]
+    waiter = employees[0]
+
+    module = types.ModuleType("backend")
+    module.get_all_menu_items = lambda: list(menu_items)
+    module.get_active_menu_items = lambda: [item for item in menu_items if item['is_active']]
+    module.get_all_employees = lambda: list(employees)
+    module.get_positions = lambda: list(positions)
+    module.get_all_orders = lambda: list(orders)
+    module.get_customer_orders = lambda customer_id: list(customer_orders)
+    module.get_hourly_item_demand = lambda since: list(hourly_demand)
+    module.get_employee_by_email = lambda email: dict(waiter)
+    module.get_employee_by_id = lambda employee_id: dict(waiter)
+    module.create_customer_if_not_exists = lambda email, first_name=None, last_name=None, phone_number=None: str(uuid.UUID(int=0))
+    module.create_employee = lambda *args: True
+    module.create_menu_item = lambda *args, **kwargs: True
+    module.create_order = lambda *args: True
+    module.update_employee = lambda *args: True
+    module.update_employees = lambda employees: ([], [])
+    module.update_menu_item = lambda *args: True
+    module.update_menu_items = lambda menu_items: ([], [])
+    module.update_order_status = lambda *args: True
+    module.delete_employee = lambda *args: True
+    module.delete_menu_item = lambda *args: True
+    module.delete_menu_items = lambda menu_items: ([], [])
+    return module
+
+# --- Driving the App ---
+
+def load_roles():
+    """Reads the ROLES login table out of frontend.py without running the app."""
+    with open(FRONTEND_PATH) as f:
+        tree = ast.parse(f.read())
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(getattr(t, "id", None) == "ROLES" for t in node.targets):
+            return ast.literal_eval(node.value)
+    raise RuntimeError("ROLES not found in frontend.py")
+
+def login(email, password, timeout):
+    """Starts a fresh app session and logs in. Returns the AppTest."""
+    at = AppTest.from_file(FRONTEND_PATH, default_timeout=timeout)
+    at.run()
+    next(w for w in at.text_input if w.label == "Email").input(email)
+    next(w for w in at.text_input if w.label == "Password").input(password)
+    next(b for b in at.button if b.label == "Login").click()
+    at.run()
+    if not at.session_state["authenticated"]:
+        raise RuntimeError(f"Login failed for {email}")
+    return at
+
+def view_names(at):
+    """Lists the views reachable from the current session."""
+    if at.session_state["role"] == "customer":
+        return [CUSTOMER_VIEW]
+    return list(at.sidebar.radio[0].options)
+
+def run_view(at, view):
+    """Re-runs the app with the given view selected."""
+    if view == CUSTOMER_VIEW:
+        at.run()
+    else:
+        at.sidebar.radio[0].set_value(view).run()
+    if at.exception:
+        raise RuntimeError(f"{view} raised: {at.exception[0].message}")
+
+def clear_cached_data(at):
+    """Drops st.cache_data entries and the data editors' loaded snapshots."""
+    st.cache_data.clear()
+    for key in EDITOR_SNAPSHOTS:
+        if key in at.session_state:
+            del at.session_state[key]
+
+def profile_view(at, view, timer):
+    """Times one render of a view by phase, then measures its peak memory in a second render.
+
+    Caches and editor snapshots are cleared before each render so that both measure a cold load.
+    """
+    clear_cached_data(at)
+    timer.reset()
+    start = time.perf_counter()
+    run_view(at, view)
+    total = time.perf_counter() - start
+    backend_s = timer.totals.get("backend", 0.0)
+    pandas_s = timer.totals.get("pandas", 0.0)
+    compute_s = timer.totals.get("compute", 0.0)
+
+    # tracemalloc slows everything down, so memory is measured on a separate, untimed run.
+    clear_cached_data(at)
+    tracemalloc.start()
+    try:
+        run_view(at, view)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'view': view,
+        'total_ms': round(total * 1000, 1),
+        'backend_ms': round(backend_s * 1000, 1),
+        'pandas_ms': round(pandas_s * 1000, 1),
+        'compute_ms': round(compute_s * 1000, 1),
+        'render_ms': round((total - backend_s - pandas_s - compute_s) * 1000, 1),
+        'peak_memory_mb': round(peak / 2 ** 20, 1),
+    }
+
+def profile_all(scale, live, timeout):
+    """Profiles every view for every account in ROLES. Returns one result dict per (account, view)."""
+    timer = PhaseTimer()
+    # The instrumented modules replace the real ones in sys.modules until profiling is done.
+    originals = {name: sys.modules.get(name) for name in ("backend", "forecasting")}
+    if live:
+        source = importlib.import_module("backend")
+    else:
+        source = synthetic_backend(scale)
+
+    results = []
+    restore_pandas = None
+    try:
+        instrument_backend(timer, source)
+        instrument_compute(timer)
+        restore_pandas = instrument_pandas(timer)
+        for email, account in load_roles().items():
+            at = login(email, account["password"], timeout)
+            for view in view_names(at):
+                result = profile_view(at, view, timer)
+                result.update({'email': email, 'role': account["role"]})
+                results.append(result)
+    finally:
+        if restore_pandas:
+            restore_pandas()
+        for name, module in originals.items():
+            if module is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = module
+    return results
+
+# --- Reporting ---
+
+def print_report(results, budget_ms):
+    """Prints a per-view timing table, marking views over budget."""
+    columns = ["role", "email", "view", "total_ms", "backend_ms", "pandas_ms", "compute_ms", "render_ms", "peak_memory_mb"]
+    df = pd.DataFrame(results, columns=columns)
+    df["over_budget"] = df["total_ms"] > budget_ms
+    print(df.to_string(index=False))
+
+def main(argv=None):
+    """Runs the profiler from the command line. Returns the process exit status."""
+    parser = argparse.ArgumentParser(description="Profile every frontend view headlessly.")
+    parser.add_argument("--scale", type=int, default=1000, help="Rows per table in the synthetic backend.")
+    parser.add_argument("--budget-ms", type=float, default=2000, help="Latency budget per view render.")
+    parser.add_argument("--live", action="store_true", help="Use the real database instead of synthetic data.")
+    parser.add_argument("--timeout", type=float, default=120, help="Seconds to allow each app run.")
+    parser.add_argument("--json", help="Also write the results to this file.")
+    args = parser.parse_args(argv)
+    if args.scale < 1:
+        parser.error("--scale must be at least 1")
+
+    results = profile_all(args.scale, args.live, args.timeout)
+    print_report(results, args.budget_ms)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({'scale': args.scale, 'budget_ms': args.budget_ms, 'results': results}, f, indent=2)
+
+    over = [r for r in results if r['total_ms'] > args.budget_ms]
+    for r in over:
+        print(f"Over budget: {r['view']} as {r['email']} took {r['total_ms']} ms (budget {args.budget_ms} ms)")
+    return 1 if over else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
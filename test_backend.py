@@ -0,0 +1,92 @@
+# test_backend.py
+import psycopg2
+
+import backend
+
+class FakeCursor:
+    """Cursor stand-in that replays a rowcount (or error) for each versioned statement."""
+
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+        self.statements = []
+        self.rowcount = -1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params=None):
+        self.statements.append((query.strip(), params))
+        if query.strip().startswith(("SAVEPOINT", "RELEASE", "ROLLBACK")):
+            return
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        self.rowcount = outcome
+
+class FakeConnection:
+    def __init__(self, cursor):
+        self.cur = cursor
+        self.committed = False
+        self.closed = False
+
+    def cursor(self, **kwargs):
+        return self.cur
+
+    def commit(self):
+        self.committed = True
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+def connect(monkeypatch, outcomes):
+    conn = FakeConnection(FakeCursor(outcomes))
+    monkeypatch.setattr(backend, "get_db_connection", lambda: conn)
+    return conn
+
+def employee(employee_id, row_version):
+    return {
+        'employee_id': employee_id, 'first_name': "Ann", 'last_name': "Lee", 'email': f"{employee_id}@x.com",
+        'phone_number': "555", 'hire_date': "2024-01-01", 'salary': 1.0, 'position_id': 1, 'row_version': row_version
+    }
+
+def test_update_employees_reports_version_mismatches_as_conflicts(monkeypatch):
+    conn = connect(monkeypatch, [1, 0, 1])
+
+    result = backend.update_employees([employee("e1", 1), employee("e2", 3), employee("e3", 2)])
+
+    assert result == (["e2"], [])
+    assert conn.committed and conn.closed
+    updates = [params for query, params in conn.cur.statements if query.startswith("UPDATE")]
+    assert [params[-2:] for params in updates] == [("e1", 1), ("e2", 3), ("e3", 2)]
+
+def test_update_menu_items_rolls_back_only_the_failing_row(monkeypatch):
+    conn = connect(monkeypatch, [psycopg2.IntegrityError("duplicate"), 1])
+    items = [
+        {'menu_item_id': "m1", 'item_name': "Soup", 'description': "", 'price': 1, 'is_active': True, 'row_version': 1},
+        {'menu_item_id': "m2", 'item_name': "Tea", 'description': "", 'price': 1, 'is_active': True, 'row_version': 1},
+    ]
+
+    assert backend.update_menu_items(items) == ([], ["m1"])
+    assert conn.committed
+    assert "ROLLBACK TO SAVEPOINT versioned_row;" in [query for query, params in conn.cur.statements]
+
+def test_delete_menu_items_checks_the_loaded_version(monkeypatch):
+    conn = connect(monkeypatch, [0, 1])
+
+    result = backend.delete_menu_items([{'menu_item_id': "m1", 'row_version': 2}, {'menu_item_id': "m2", 'row_version': 5}])
+
+    assert result == (["m1"], [])
+    deletes = [(query, params) for query, params in conn.cur.statements if query.startswith("DELETE")]
+    assert all("row_version = %s" in query for query, params in deletes)
+    assert [params for query, params in deletes] == [("m1", 2), ("m2", 5)]
+
+def test_single_row_update_returns_false_on_conflict(monkeypatch):
+    connect(monkeypatch, [0])
+
+    assert backend.update_employee("e1", "Ann", "Lee", "a@x.com", "555", "2024-01-01", 1.0, 1, 7) is False
\ No newline at end of file
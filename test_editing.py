@@ -0,0 +1,55 @@
+# test_editing.py
+import numpy as np
+import pandas as pd
+
+import editing
+
+def menu_df():
+    return pd.DataFrame([
+        {'menu_item_id': "m1", 'item_name': "Soup", 'description': None, 'price': 3.5, 'row_version': 1},
+        {'menu_item_id': "m2", 'item_name': "Tea", 'description': "Hot", 'price': 2.0, 'row_version': 4},
+        {'menu_item_id': "m3", 'item_name': "Cake", 'description': np.nan, 'price': 4.0, 'row_version': 2},
+    ])
+
+def test_changed_rows_returns_only_edited_rows():
+    df = menu_df()
+    edited = df.copy()
+    edited.loc[1, 'price'] = 2.5
+
+    changed = editing.changed_rows(df, edited, "menu_item_id")
+
+    assert list(changed["menu_item_id"]) == ["m2"]
+    assert changed.loc[0, 'price'] == 2.5
+    assert changed.loc[0, 'row_version'] == 4
+
+def test_changed_rows_treats_missing_values_as_equal():
+    df = menu_df()
+    edited = df.copy()
+    edited['description'] = edited['description'].astype(object).where(edited['description'].notna(), None)
+
+    assert editing.changed_rows(df, edited, "menu_item_id").empty
+
+def test_changed_rows_ignores_added_and_deleted_rows():
+    df = menu_df()
+    added = pd.DataFrame([{'menu_item_id': None, 'item_name': "New", 'description': None, 'price': 1.0, 'row_version': None}])
+    edited = pd.concat([df.drop(index=2), added], ignore_index=True)
+
+    assert editing.changed_rows(df, edited, "menu_item_id").empty
+
+def test_resolve_result_counts_every_row_as_failed_when_the_save_failed():
+    labels = {"m1": "Soup", "m2": "Tea"}
+
+    assert editing.resolve_result(labels, None) == ([], ["m1", "m2"])
+    assert editing.resolve_result(labels, (["m2"], [])) == (["m2"], [])
+
+def test_merge_results_combines_batches():
+    result = editing.merge_results((["m1"], (["m1"], [])), (["m2", "m3"], None), (["m4"], ([], ["m4"])))
+
+    assert result == (["m1"], ["m2", "m3", "m4"])
+
+def test_advance_versions_bumps_updates_and_forgets_deletes():
+    versions = {"m1": 1, "m2": 4, "m3": 2}
+
+    editing.advance_versions(versions, ["m1", "m3"], deleted=["m3"])
+
+    assert versions == {"m1": 2, "m2": 4}
@@ -0,0 +1,44 @@
+# test_forecasting.py
+import numpy as np
+from datetime import datetime
+
+import forecasting
+
+def naive_seasonal_levels(demand, alpha):
+    """Smooths each weekly slot of a dense (items, hours) demand matrix week by week."""
+    n_items, n_hours = demand.shape
+    levels = np.zeros((n_items, forecasting.HOURS_PER_WEEK))
+    for slot in range(forecasting.HOURS_PER_WEEK):
+        weeks = [demand[:, hour] for hour in range(slot, n_hours, forecasting.HOURS_PER_WEEK)]
+        if not weeks:
+            continue
+        level = weeks[0].astype(float)
+        for observed in weeks[1:]:
+            level = alpha * observed + (1 - alpha) * level
+        levels[:, slot] = level
+    return levels
+
+def test_fit_seasonal_levels_matches_naive_smoothing():
+    rng = np.random.default_rng(0)
+    n_items, alpha = 6, 0.3
+    start_hour = forecasting.week_start(forecasting.to_hour(datetime(2024, 1, 10)))
+    # Three full weeks plus a partial fourth, ending on Wednesday afternoon.
+    end_hour = start_hour + 3 * forecasting.HOURS_PER_WEEK + 2 * 24 + 15
+    demand = (rng.random((n_items, end_hour - start_hour)) < 0.2) * rng.integers(1, 5, (n_items, end_hour - start_hour))
+
+    item_index, offsets = np.nonzero(demand)
+    # Orders after the window must be ignored.
+    hours = np.concatenate([offsets + start_hour, [end_hour, end_hour + 5]])
+    item_index = np.concatenate([item_index, [0, 1]])
+    quantities = np.concatenate([demand[np.nonzero(demand)], [7, 9]]).astype(float)
+
+    levels = forecasting.fit_seasonal_levels(item_index, hours, quantities, n_items, start_hour, end_hour, alpha)
+
+    np.testing.assert_allclose(levels, naive_seasonal_levels(demand, alpha), atol=1e-12)
+
+def test_season_slot_starts_on_monday_midnight():
+    monday = forecasting.to_hour(datetime(2026, 10, 19))
+    assert forecasting.season_slot(monday) == 0
+    assert forecasting.season_slot(monday + 5) == 5
+    assert forecasting.season_slot(monday - 1) == forecasting.HOURS_PER_WEEK - 1
+    assert forecasting.week_start(monday + 100) == monday